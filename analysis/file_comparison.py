@@ -2,7 +2,9 @@
 # has been run through a given compressor.
 
 import argparse
+import functools
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from core.data_encoder_decoder import DataEncoder
 from core.data_block import DataBlock
 from datetime import datetime
@@ -14,65 +16,43 @@ from png_compressors.filtered_zstd import FilteredZstd
 from png_tools.png_filters import FilterHeuristic
 
 
+# Channel counts for common PIL modes, so the uncompressed-size calculation
+# doesn't need to introspect the image via getbands().
+_MODE_CHANNELS = {"L": 1, "LA": 2, "P": 1, "RGB": 3, "RGBA": 4}
+
+
+def _ts() -> str:
+    """Returns a timestamp for log lines."""
+    return datetime.now().isoformat(sep=" ", timespec="seconds")
+
+
+# Encoder constructors keyed by sanitized name (lowercase, underscores
+# stripped), so "filtered_zlib" and "filteredzlib" share an entry. Built once
+# at import instead of walking an if/elif chain per call.
+_ENCODER_FACTORIES = {
+    "filteredzlib": FilteredZlib,
+    "filteredzstd": FilteredZstd,
+    "filteredlzarithmetic": FilteredLzArithmetic,
+}
+for _order in range(5):
+    _factory = functools.partial(FilteredArithmetic, order=_order)
+    _ENCODER_FACTORIES["arithmetic%d" % _order] = _factory
+    _ENCODER_FACTORIES["filteredarithmetic%d" % _order] = _factory
+
+
 def get_encoder(encoder_name: str, width: int, height: int, separate: bool,
                 verbose: bool, heuristic: FilterHeuristic) -> DataEncoder:
     """Returns encoder based on `encoder_name`."""
-    sanitized = encoder_name.lower()
-    if (sanitized == "filteredzlib" or sanitized == "filtered_zlib"):
-        return FilteredZlib(width,
-                            height,
-                            prepend_filter_type=separate,
-                            debug_logs=verbose,
-                            heuristic=heuristic)
-    elif (sanitized == "filteredzstd" or sanitized == "filtered_zstd"):
-        return FilteredZstd(width,
-                            height,
-                            prepend_filter_type=separate,
-                            debug_logs=verbose,
-                            heuristic=heuristic)
-    elif (sanitized == "filteredlzarithmetic"):
-        return FilteredLzArithmetic(width,
-                                    height,
-                                    prepend_filter_type=separate,
-                                    debug_logs=verbose,
-                                    heuristic=heuristic)
-    elif (sanitized == "arithmetic0" or sanitized == "filtered_arithmetic0"):
-        return FilteredArithmetic(width,
-                                  height,
-                                  prepend_filter_type=separate,
-                                  debug_logs=verbose,
-                                  heuristic=heuristic,
-                                  order=0)
-    elif (sanitized == "arithmetic1" or sanitized == "filtered_arithmetic1"):
-        return FilteredArithmetic(width,
-                                  height,
-                                  prepend_filter_type=separate,
-                                  debug_logs=verbose,
-                                  heuristic=heuristic,
-                                  order=1)
-    elif (sanitized == "arithmetic2" or sanitized == "filtered_arithmetic2"):
-        return FilteredArithmetic(width,
-                                  height,
-                                  prepend_filter_type=separate,
-                                  debug_logs=verbose,
-                                  heuristic=heuristic,
-                                  order=2)
-    elif (sanitized == "arithmetic3" or sanitized == "filtered_arithmetic3"):
-        return FilteredArithmetic(width,
-                                  height,
-                                  prepend_filter_type=separate,
-                                  debug_logs=verbose,
-                                  heuristic=heuristic,
-                                  order=3)
-    elif (sanitized == "arithmetic4" or sanitized == "filtered_arithmetic4"):
-        return FilteredArithmetic(width,
-                                  height,
-                                  prepend_filter_type=separate,
-                                  debug_logs=verbose,
-                                  heuristic=heuristic,
-                                  order=4)
-
-    raise ValueError("Unrecognized encoder type: %s" % encoder_name)
+    sanitized = encoder_name.lower().replace("_", "")
+    factory = _ENCODER_FACTORIES.get(sanitized)
+    if factory is None:
+        raise ValueError("Unrecognized encoder type: %s" % encoder_name)
+
+    return factory(width,
+                   height,
+                   prepend_filter_type=separate,
+                   debug_logs=verbose,
+                   heuristic=heuristic)
 
 
 def get_heuristic(heuristic: str) -> FilterHeuristic:
@@ -83,7 +63,7 @@ def get_heuristic(heuristic: str) -> FilterHeuristic:
     elif sanitized == "diffsum":
         chosen = FilterHeuristic.MINIMUM_DIFFERENCE_SUM
 
-    print(f'[{str(datetime.now())}]: Using heuristic: {chosen}')
+    print(f'[{_ts()}]: Using heuristic: {chosen}')
     return chosen
 
 
@@ -92,32 +72,85 @@ def compare_file(filename: str, encoder_name: str, separate: bool,
     """Opens file and prints comparison."""
 
     # Open file.
-    file_stats = os.stat(filename)
-    print("[%s]: Original PNG size: %d bytes" %
-          (str(datetime.now()), file_stats.st_size))
+    original_size = os.path.getsize(filename)
+    print("[%s]: Original PNG size: %d bytes" % (_ts(), original_size))
 
+    # Image.open only parses the header; force the (lazy) PNG decode now so
+    # it isn't silently attributed to compression time below.
+    decode_start = datetime.now()
     image = Image.open(filename)
-    print("[%s]: Image data has been successfully opened." %
-          str(datetime.now()))
+    image.load()
+    if verbose:
+        elapsed = (datetime.now() - decode_start).total_seconds()
+        print("[%s]: PNG decode took %.3fs." % (_ts(), elapsed))
+    print("[%s]: Image data has been successfully opened." % _ts())
 
     # Configure encoder.
     chosen_heuristic = get_heuristic(heuristic)
     encoder = get_encoder(encoder_name, image.width, image.height, separate,
-                          verbose, heuristic)
-    print("[%s]: Beginning compression with %s." %
-          (str(datetime.now()), encoder_name))
-    print("[%s]: Encoding prefix separately: " % str(datetime.now()), separate)
+                          verbose, chosen_heuristic)
+    ts = _ts()
+    print("[%s]: Beginning compression with %s." % (ts, encoder_name))
+    print("[%s]: Encoding prefix separately: " % ts, separate)
 
-    # Encode image.
-    encoded = encoder.encode_image(image)
+    # Encode image. Only the encoded length matters here, so consume the
+    # encoding block by block rather than materializing the full bitstream.
+    compressed_bits = sum(
+        len(chunk) for chunk in encoder.encode_image_blocks(image))
 
     # Calculate and output results.
-    original_byte_length = image.width * image.height * len(image.getbands())
-    compressed_byte_length = len(encoded) / 8
+    num_channels = _MODE_CHANNELS.get(image.mode, len(image.getbands()))
+    original_byte_length = image.width * image.height * num_channels
+    compressed_byte_length = compressed_bits / 8
+    ts = _ts()
     print("[%s]: Compressed with %s: %d bytes" %
-          (str(datetime.now()), encoder_name, compressed_byte_length))
-    print("[%s]: That's a compression ratio of %.2f" % (str(
-        datetime.now()), original_byte_length / float(compressed_byte_length)))
+          (ts, encoder_name, compressed_byte_length))
+    print("[%s]: That's a compression ratio of %.2f" %
+          (ts, original_byte_length / float(compressed_byte_length)))
+
+
+def _encode_one(filename: str, encoder_name: str, separate: bool,
+                verbose: bool, heuristic: str):
+    """Worker for `compare_many`: encodes `filename` with one encoder.
+
+    Re-opens the image inside the worker process (PIL images don't pickle)
+    and returns the encoder name plus the compressed bit count.
+    """
+    image = Image.open(filename)
+    chosen_heuristic = get_heuristic(heuristic)
+    encoder = get_encoder(encoder_name, image.width, image.height, separate,
+                          verbose, chosen_heuristic)
+    compressed_bits = sum(
+        len(chunk) for chunk in encoder.encode_image_blocks(image))
+    return encoder_name, compressed_bits
+
+
+def compare_many(filename: str, encoder_names, separate: bool, verbose: bool,
+                 heuristic: str):
+    """Prints comparison for several encoders, run in parallel.
+
+    The encoders are independent of one another, so each runs in its own
+    process and results are printed as they complete.
+    """
+    original_size = os.path.getsize(filename)
+    print("[%s]: Original PNG size: %d bytes" % (_ts(), original_size))
+
+    image = Image.open(filename)
+    num_channels = _MODE_CHANNELS.get(image.mode, len(image.getbands()))
+    original_byte_length = image.width * image.height * num_channels
+
+    with ProcessPoolExecutor() as executor:
+        futures = {
+            executor.submit(_encode_one, filename, name, separate, verbose,
+                            heuristic): name
+            for name in encoder_names
+        }
+        for future in as_completed(futures):
+            encoder_name, compressed_bits = future.result()
+            compressed_byte_length = compressed_bits / 8
+            print("[%s]: Compressed with %s: %d bytes (ratio %.2f)" %
+                  (_ts(), encoder_name, compressed_byte_length,
+                   original_byte_length / float(compressed_byte_length)))
 
 
 def create_parser():
@@ -133,7 +166,8 @@ def create_parser():
         "-c",
         "--compressor",
         help=
-        "compressor name: one of filteredzlib, filteredlzarithmetic, filteredzstd, arithmetic<K> where <K>=0, 1, 2, 3, or 4",
+        "compressor name: one of filteredzlib, filteredlzarithmetic, filteredzstd, arithmetic<K> where <K>=0, 1, 2, 3, or 4. "
+        "A comma-separated list compares all of them in parallel.",
         type=str)
     parser.add_argument("-s",
                         "--separate",
@@ -155,8 +189,12 @@ def create_parser():
 def main():
     parser = create_parser()
     args = parser.parse_args()
-    compare_file(args.filename, args.compressor, args.separate, args.verbose,
-                 args.heuristic)
+    if "," in args.compressor:
+        compare_many(args.filename, args.compressor.split(","), args.separate,
+                     args.verbose, args.heuristic)
+    else:
+        compare_file(args.filename, args.compressor, args.separate,
+                     args.verbose, args.heuristic)
 
 
 if __name__ == "__main__":
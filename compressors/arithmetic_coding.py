@@ -83,10 +83,23 @@ class ArithmeticEncoder(DataEncoder):
 
     def encode_block(self, data_block: DataBlock):
         """Encode block function for arithmetic coding"""
+        return self.encode_symbols(data_block.data_list, data_block.size)
 
-        # ensure data_block.size is not too big
-        err_msg = "choose a larger DATA_BLOCK_SIZE_BITS, as data_block.size is too big"
-        assert data_block.size < (1 << self.params.MAX_BLOCK_SIZE), err_msg
+    def encode_symbols(self, symbols, num_symbols: int):
+        """Lower-level version of encode_block taking any iterable of symbols.
+
+        Callers that produce symbols incrementally (e.g. one scanline at a
+        time) can stream them through here without first materializing the
+        whole block as a Python list.
+
+        Args:
+            symbols: iterable yielding the symbols to encode
+            num_symbols (int): number of symbols `symbols` will yield
+        """
+
+        # ensure num_symbols is not too big
+        err_msg = "choose a larger DATA_BLOCK_SIZE_BITS, as num_symbols is too big"
+        assert num_symbols < (1 << self.params.MAX_BLOCK_SIZE), err_msg
 
         # initialize the low and high states
         low = 0
@@ -100,14 +113,14 @@ class ArithmeticEncoder(DataEncoder):
         # One way is to add a character at the end which signals EOF (end-of-file). This requires us to
         # change the probabilities of the other symbols. Another way is to just signal the size of the
         # block. These two approaches add a bit of overhead. We use the second approach as it is much more transparent.
-        encoded_bitarray = uint_to_bitarray(data_block.size, self.params.DATA_BLOCK_SIZE_BITS)
+        encoded_bitarray = uint_to_bitarray(num_symbols, self.params.DATA_BLOCK_SIZE_BITS)
 
         # initialize counter for mid-range re-adjustments
         # used to ensure that the range doesn't become too small avoiding finite precision problem in AEC
         num_mid_range_readjust = 0
 
         # start the encoding
-        for s in data_block.data_list:
+        for s in symbols:
             # ensure freqs.total_freq is not too big
             err_msg = """the frequency total is too large, which might cause stability issues. 
             Please increase the precision (or reduce the total_freq)"""
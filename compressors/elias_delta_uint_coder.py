@@ -28,6 +28,7 @@ Examples:
 
 """
 
+import numpy as np
 from core.data_block import DataBlock
 from core.data_encoder_decoder import DataDecoder, DataEncoder
 from utils.bitarray_utils import uint_to_bitarray, bitarray_to_uint, BitArray
@@ -38,7 +39,11 @@ class EliasDeltaUintEncoder(DataEncoder):
     """See module level documentation"""
 
     def encode_symbol(self, x: int):
-        assert isinstance(x, int)
+        assert isinstance(x, (int, np.integer))
+        # normalize NumPy scalars so the bit twiddling below sees a plain int;
+        # this lets callers pass ndarray-backed blocks without boxing the
+        # whole stream up front
+        x = int(x)
         assert x >= 0
         y = x + 1
         y_bitarray = uint_to_bitarray(y)
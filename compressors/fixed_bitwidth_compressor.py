@@ -19,7 +19,29 @@ import numpy as np
 
 
 def get_alphabet_fixed_bitwidth(alphabet_size):
-    return 1 if (alphabet_size == 1) else int(np.ceil(np.log2(alphabet_size)))
+    # ceil(log2(alphabet_size)) computed with exact integer arithmetic
+    return max((alphabet_size - 1).bit_length(), 1)
+
+
+def _decode_fixed(bitarray: BitArray, start_bit: int, symbol_bit_width: int, num_symbols: int):
+    """Extract `num_symbols` fixed-width uints from `bitarray` starting at `start_bit`.
+
+    Unpacks the underlying byte buffer once with np.unpackbits and folds the
+    resulting (num_symbols, symbol_bit_width) bit matrix back into integers,
+    instead of slicing the bitarray and calling bitarray_to_uint per symbol.
+    """
+    bits = np.unpackbits(np.frombuffer(bitarray.tobytes(), dtype=np.uint8))
+    bits = bits[start_bit : start_bit + num_symbols * symbol_bit_width]
+    bits = bits.reshape(num_symbols, symbol_bit_width)
+
+    if symbol_bit_width <= 8:
+        # Fast path for byte-or-smaller symbols (the common case): pack each
+        # row of bits back into a single byte. np.packbits pads each row on
+        # the right, so shift down to undo the padding.
+        return np.packbits(bits, axis=1)[:, 0] >> (8 - symbol_bit_width)
+
+    shifts = np.arange(symbol_bit_width - 1, -1, -1, dtype=np.uint32)
+    return (bits.astype(np.uint32) << shifts).sum(axis=1)
 
 
 class FixedBitwidthEncoder(DataEncoder):
@@ -32,6 +54,41 @@ class FixedBitwidthEncoder(DataEncoder):
         self.alphabet_encoder = PickleEncoder()
         self.DATA_SIZE_BITS = 32
 
+    @staticmethod
+    def _symbols_to_indices(alphabet, data_block: DataBlock) -> np.ndarray:
+        """map each symbol in data_block to its index in alphabet
+
+        For byte-valued symbols (ints in [0, 256) or single latin-1 chars) we
+        use a 256-entry lookup table so the translation is one vectorized
+        gather instead of a dict lookup per symbol. Other alphabets fall back
+        to a dict.
+        """
+        if all(isinstance(a, (int, np.integer)) and 0 <= a < 256 for a in alphabet):
+            lut = np.zeros(256, dtype=np.uint32)
+            for i, a in enumerate(alphabet):
+                lut[a] = i
+            # _vector_view wraps ndarray/bytes payloads zero-copy (np.asarray
+            # can't convert a bytes object to uint8 directly); list payloads
+            # fall through to one conversion here.
+            raw = data_block._vector_view()
+            if raw is None:
+                raw = np.asarray(data_block.data_list, dtype=np.uint8)
+            return lut[raw.astype(np.uint8, copy=False)]
+
+        if all(isinstance(a, str) and len(a) == 1 and ord(a) < 256 for a in alphabet):
+            lut = np.zeros(256, dtype=np.uint32)
+            for i, a in enumerate(alphabet):
+                lut[ord(a)] = i
+            raw = np.frombuffer("".join(data_block.data_list).encode("latin1"), dtype=np.uint8)
+            return lut[raw]
+
+        alphabet_dict = {a: i for i, a in enumerate(alphabet)}
+        return np.fromiter(
+            (alphabet_dict[s] for s in data_block.data_list),
+            dtype=np.uint32,
+            count=data_block.size,
+        )
+
     def encode_block(self, data_block: DataBlock):
         """first encode the alphabet and then each data symbol using fixed number of bits"""
         # get bit width
@@ -45,10 +102,20 @@ class FixedBitwidthEncoder(DataEncoder):
         encoded_bitarray += uint_to_bitarray(data_block.size, self.DATA_SIZE_BITS)
 
         # encode data
+        # Bit-pack all the symbols in one shot instead of appending one
+        # bitarray per symbol (which reallocates the output on every append).
+        # We map symbols -> alphabet indices, broadcast each index into its
+        # bits and pack the whole thing with np.packbits.
         symbol_bit_width = get_alphabet_fixed_bitwidth(len(alphabet))
-        alphabet_dict = {a: i for i, a in enumerate(alphabet)}
-        for s in data_block.data_list:
-            encoded_bitarray += uint_to_bitarray(alphabet_dict[s], bit_width=symbol_bit_width)
+        indices = self._symbols_to_indices(alphabet, data_block)
+        shifts = np.arange(symbol_bit_width - 1, -1, -1, dtype=np.uint32)
+        bits = ((indices[:, None] >> shifts) & 1).astype(np.uint8)
+        packed_bitarray = BitArray()
+        packed_bitarray.frombytes(np.packbits(bits.reshape(-1)).tobytes())
+
+        # np.packbits pads the last byte with zeros, so truncate to the exact
+        # number of data bits.
+        encoded_bitarray += packed_bitarray[: data_block.size * symbol_bit_width]
 
         return encoded_bitarray
 
@@ -76,12 +143,9 @@ class FixedBitwidthDecoder(DataDecoder):
 
         # decode data
         symbol_bit_width = get_alphabet_fixed_bitwidth(len(alphabet))
-        data_list = []
-        for _ in range(data_size):
-            symbol_bitarray = bitarray[num_bits_consumed : (num_bits_consumed + symbol_bit_width)]
-            ind = bitarray_to_uint(symbol_bitarray)
-            data_list.append(alphabet[ind])
-            num_bits_consumed += symbol_bit_width
+        indices = _decode_fixed(bitarray, num_bits_consumed, symbol_bit_width, data_size)
+        data_list = [alphabet[i] for i in indices]
+        num_bits_consumed += data_size * symbol_bit_width
 
         return DataBlock(data_list), num_bits_consumed
 
@@ -105,17 +169,28 @@ class TextAlphabetEncoder(DataEncoder):
 
         - Encodes the size of the alphabet set using 8 bits
         - The ascii value corresponding to each alphabet is then encoded using 8 bits
+
+        `alphabet` may be bytes/bytearray, a str, or an iterable of single
+        characters. Byte inputs are used as-is, avoiding a per-symbol
+        chr()/ord() round trip.
         """
 
         # encode the alphabet size
         alphabet_size = len(alphabet)
         assert alphabet_size < 2 ** self.alphabet_size_bits
-        alphabet_size_bitarray = uint_to_bitarray(alphabet_size, self.alphabet_size_bits)
-
-        bitarray = alphabet_size_bitarray
-        for a in alphabet:
-            bitarray += uint_to_bitarray(ord(a), bit_width=self.alphabet_bits)
 
+        # both the size and each symbol are byte-wide, so the whole encoding
+        # is just a bytes payload -- build it once instead of appending one
+        # bitarray per character
+        if isinstance(alphabet, (bytes, bytearray)):
+            symbols = bytes(alphabet)
+        elif isinstance(alphabet, str):
+            symbols = alphabet.encode("latin1")
+        else:
+            symbols = "".join(alphabet).encode("latin1")
+
+        bitarray = BitArray()
+        bitarray.frombytes(bytes([alphabet_size]) + symbols)
         return bitarray
 
 
@@ -135,14 +210,12 @@ class TextAlphabetDecoder(DataDecoder):
         alphabet_size = bitarray_to_uint(params_data_bitarray[: self.alphabet_size_bits])
         num_bits_consumed += self.alphabet_size_bits
 
-        alphabet = []
-        for _ in range(alphabet_size):
-            symbol_bitarray = params_data_bitarray[
-                num_bits_consumed : (num_bits_consumed + self.alphabet_bits)
-            ]
-            symbol = chr(bitarray_to_uint(symbol_bitarray))
-            alphabet.append(symbol)
-            num_bits_consumed += self.alphabet_bits
+        # the alphabet payload is byte-aligned after the size field, so pull
+        # it out as bytes in one go rather than slicing 8 bits per symbol
+        end = num_bits_consumed + self.alphabet_bits * alphabet_size
+        payload = params_data_bitarray[num_bits_consumed:end].tobytes()
+        alphabet = [chr(b) for b in payload]
+        num_bits_consumed = end
 
         return alphabet, num_bits_consumed
 
@@ -214,6 +287,19 @@ def test_fixed_bitwidth_encode_decode():
     assert (codelen / DATA_SIZE - 2.0) < 1e-2
 
 
+def test_fixed_bitwidth_bytes_payload_encode_decode():
+    """bytes payloads should flow through the byte LUT without a list round trip"""
+    # define encoder, decoder
+    encoder = FixedBitwidthEncoder()
+    decoder = FixedBitwidthDecoder()
+
+    # create some sample data as a raw bytes payload
+    data_block = DataBlock(bytes([0, 255, 17, 17, 3, 255, 0, 42]))
+
+    is_lossless, _, _ = try_lossless_compression(data_block, encoder, decoder)
+    assert is_lossless
+
+
 def test_text_fixed_bitwidth_file_encode_decode():
     """full test for FixedBitWidthEncoder and FixedBitWidthDecoder
 
@@ -89,6 +89,7 @@ All sizes are in bytes.
 
 import argparse
 from dataclasses import dataclass
+import numpy as np
 import os
 import tempfile
 from typing import List, Tuple
@@ -109,9 +110,15 @@ from utils.test_utils import (
 ENCODED_BLOCK_SIZE_HEADER_BITS = (
     32  # number of bits used to put a header consisting of encoded block size
 )
+MIN_MATCH_LENGTH_HEADER_BITS = (
+    8  # number of bits used to transmit min_match_length ahead of the sequences
+)
 DEFAULT_MIN_MATCH_LEN = 6
 DEFAULT_MAX_NUM_MATCHES_CONSIDERED = 64
 
+# the Elias Delta coder is stateless, so one instance serves every block
+_ELIAS_DELTA_ENCODER = EliasDeltaUintEncoder()
+
 
 @dataclass
 class LZ77Sequence:
@@ -203,24 +210,40 @@ class LZ77Encoder(DataEncoder):
         Args:
             encoded_bitarray (BitArray): encoded bit array
         """
-        literal_counts = [l.literal_count for l in lz77_sequences]
-        # subtract min_match_length from match_length
-        match_lengths_processed = [l.match_length - self.min_match_length for l in lz77_sequences]
-        # subtract 1 from match offset because it's at least 1
-        match_offsets_processed = [l.match_offset - 1 for l in lz77_sequences]
-        # Combine all streams into one and then apply Elias Delta.
-        # first encode the min_match_length (needed because we subtract it from match_lengths)
-        combined = (
-            [self.min_match_length]
-            + literal_counts
-            + match_lengths_processed
-            + match_offsets_processed
+        num_sequences = len(lz77_sequences)
+        literal_counts = np.fromiter(
+            (l.literal_count for l in lz77_sequences), dtype=np.int64, count=num_sequences
+        )
+        match_lengths = np.fromiter(
+            (l.match_length for l in lz77_sequences), dtype=np.int64, count=num_sequences
+        )
+        match_offsets = np.fromiter(
+            (l.match_offset for l in lz77_sequences), dtype=np.int64, count=num_sequences
+        )
+        # Combine all streams into one and then apply Elias Delta. The
+        # match-length/offset preprocessing (subtract min_match_length, and 1
+        # since offsets are at least 1) happens as two vectorized subtracts.
+        combined = np.concatenate(
+            (
+                literal_counts,
+                match_lengths - self.min_match_length,
+                match_offsets - 1,
+            )
         )
-        combined_encoding = EliasDeltaUintEncoder().encode_block(DataBlock(combined))
-        return (
+        combined_encoding = _ELIAS_DELTA_ENCODER.encode_block(DataBlock(combined))
+        # min_match_length is a small constant the decoder needs to undo the
+        # subtraction above; transmit it as a fixed-width prefix rather than
+        # splicing it into the variable-length stream as a fake first symbol
+        assert self.min_match_length < (1 << MIN_MATCH_LENGTH_HEADER_BITS)
+        # assemble with in-place extend: each + on bitarrays copies both operands
+        encoded_bitarray = uint_to_bitarray(
+            self.min_match_length, MIN_MATCH_LENGTH_HEADER_BITS
+        )
+        encoded_bitarray.extend(
             uint_to_bitarray(len(combined_encoding), ENCODED_BLOCK_SIZE_HEADER_BITS)
-            + combined_encoding
         )
+        encoded_bitarray.extend(combined_encoding)
+        return encoded_bitarray
 
     def encode_literals(self, literals: List):
         """Perform entropy encoding of the literals and return the encoded bitarray.
@@ -231,32 +254,33 @@ class LZ77Encoder(DataEncoder):
         Args:
             encoded_bitarray (BitArray): encoded bit array
         """
-        # first encode the literals with empirical Huffman code
-        counts = DataBlock(literals).get_counts()
-        if len(counts) > 0:
-            prob_dict = ProbabilityDist.normalize_prob_dict(counts).prob_dict
-            # let's sort prob_dist by the alphabet to make sure we get exact same ordering
-            # during decompression as well, which makes sure it's the same Huffman tree!
-            prob_dist_sorted = ProbabilityDist({i: prob_dict[i] for i in sorted(prob_dict)})
+        # first encode the literals with empirical Huffman code. bincount
+        # builds the full 256-entry count table in one C pass; its nonzero
+        # entries double as the count dict, already in ascending symbol order
+        # so the Huffman tree matches the decoder's reconstruction without a
+        # separate sort.
+        counts_list = np.bincount(np.asarray(literals, dtype=np.uint8), minlength=256)
+        if len(literals) > 0:
+            counts = {int(i): int(counts_list[i]) for i in np.flatnonzero(counts_list)}
+            prob_dist_sorted = ProbabilityDist.normalize_prob_dict(counts)
 
             literals_encoding = HuffmanEncoder(prob_dist_sorted).encode_block(DataBlock(literals))
 
             # Now encode the counts using Elias Delta code.
-            # We first generate a list of counts (of length 256) and then apply Elias Delta.
-            # For any bytes not seen in the data, set count to 0.
-            for i in range(256):
-                if i not in counts:
-                    counts[i] = 0
-            counts_list = [counts[i] for i in range(256)]
-
-            counts_encoding = EliasDeltaUintEncoder().encode_block(DataBlock(counts_list))
-            # combine everything into a single bitarray
-            return (
-                uint_to_bitarray(len(counts_encoding), ENCODED_BLOCK_SIZE_HEADER_BITS)
-                + counts_encoding
-                + uint_to_bitarray(len(literals_encoding), ENCODED_BLOCK_SIZE_HEADER_BITS)
-                + literals_encoding
+            # We transmit the full list of counts (of length 256, zeros for
+            # unseen bytes) so the decoder can rebuild the same tree.
+            counts_encoding = _ELIAS_DELTA_ENCODER.encode_block(DataBlock(counts_list))
+            # combine everything into a single bitarray, extending in place
+            # rather than chaining + (which copies both operands per concat)
+            encoded_bitarray = uint_to_bitarray(
+                len(counts_encoding), ENCODED_BLOCK_SIZE_HEADER_BITS
+            )
+            encoded_bitarray.extend(counts_encoding)
+            encoded_bitarray.extend(
+                uint_to_bitarray(len(literals_encoding), ENCODED_BLOCK_SIZE_HEADER_BITS)
             )
+            encoded_bitarray.extend(literals_encoding)
+            return encoded_bitarray
         else:
             # if no counts (i.e., no literals) just transmit 0
             return uint_to_bitarray(0, ENCODED_BLOCK_SIZE_HEADER_BITS)
@@ -298,7 +322,12 @@ class LZ77Encoder(DataEncoder):
         pos_in_window = len(self.window)
 
         # put the entire data block in the window at once, we will find matches later
-        self.window += data_block.data_list
+        # (the window is a plain list of Python ints -- the matcher hashes
+        # tuples of it -- so ndarray payloads are unboxed here in one shot)
+        data_list = data_block.data_list
+        if isinstance(data_list, np.ndarray):
+            data_list = data_list.tolist()
+        self.window += data_list
 
         # now go over the window starting at pos_in_window and try to find matches
         # in the past
@@ -370,7 +399,8 @@ class LZ77Encoder(DataEncoder):
         # now encode sequences and literals
         lz77_sequences_encoding = self.encode_lz77_sequences(lz77_sequences)
         literals_encoding = self.encode_literals(literals)
-        return lz77_sequences_encoding + literals_encoding
+        lz77_sequences_encoding.extend(literals_encoding)
+        return lz77_sequences_encoding
 
     def encode_file(self, input_file_path: str, encoded_file_path: str, block_size: int = 10000):
         """utility wrapper around the encode function using Uint8FileDataStream
@@ -405,7 +435,12 @@ class LZ77Decoder(DataDecoder):
         Args:
             encoded_bitarray (BitArray): encoded bit array
         """
-        # first get the encoded block size so we can pick out the block for decoding
+        # first read the fixed-width min_match_length prefix
+        min_match_length = bitarray_to_uint(
+            encoded_bitarray[:MIN_MATCH_LENGTH_HEADER_BITS]
+        )
+        encoded_bitarray = encoded_bitarray[MIN_MATCH_LENGTH_HEADER_BITS:]
+        # then get the encoded block size so we can pick out the block for decoding
         encoded_block_size_bitarray = encoded_bitarray[:ENCODED_BLOCK_SIZE_HEADER_BITS]
         encoded_block_size = bitarray_to_uint(encoded_block_size_bitarray)
         encoded_bitarray = encoded_bitarray[
@@ -417,19 +452,17 @@ class LZ77Decoder(DataDecoder):
         )
         combined_decoded = combined_decoded.data_list
         assert num_bits_consumed_encoding == encoded_block_size
-        num_bits_consumed = ENCODED_BLOCK_SIZE_HEADER_BITS + encoded_block_size
-        assert (len(combined_decoded) - 1) % 3 == 0
-        num_sequences = (len(combined_decoded) - 1) // 3
-        min_match_length = combined_decoded[0]
-        literal_counts = combined_decoded[1 : 1 + num_sequences]
+        num_bits_consumed = (
+            MIN_MATCH_LENGTH_HEADER_BITS + ENCODED_BLOCK_SIZE_HEADER_BITS + encoded_block_size
+        )
+        assert len(combined_decoded) % 3 == 0
+        num_sequences = len(combined_decoded) // 3
+        literal_counts = combined_decoded[:num_sequences]
         # need to adjust lengths and offsets to undo the processing we did on the compressor
         match_lengths = [
-            l + min_match_length
-            for l in combined_decoded[1 + num_sequences : 1 + 2 * num_sequences]
-        ]
-        match_offsets = [
-            l + 1 for l in combined_decoded[1 + 2 * num_sequences : 1 + 3 * num_sequences]
+            l + min_match_length for l in combined_decoded[num_sequences : 2 * num_sequences]
         ]
+        match_offsets = [l + 1 for l in combined_decoded[2 * num_sequences :]]
         lz77_sequences = [
             LZ77Sequence(l[0], l[1], l[2])
             for l in zip(literal_counts, match_lengths, match_offsets)
@@ -117,19 +117,38 @@ class AdaptiveOrderKFreqModel(FreqModelBase):
 
         self.alphabet = alphabet
 
+        # cache for freqs_current: the arithmetic coder reads freqs_current
+        # multiple times per symbol, and rebuilding the Frequencies dict on
+        # every read dominates the coding loop for all orders
+        self._freqs_current_cached = None
+
     @property
     def freqs_current(self):
         """Calculate the current freqs. For order 0, we just give back the freqs. For k > 0,
         we use the past k symbols to pick out the corresponding frequencies for the (k+1)th.
+
+        The result is cached until the next update_model call.
         """
-        if self.k > 0:
-            # convert self.past_k to enable indexing
-            # use np.ravel to convert to flat array
-            freqs_given_context = np.ravel(self.freqs_kplus1_tuple[tuple(self.past_k)])
-        else:
-            freqs_given_context = self.freqs_kplus1_tuple
-        # convert from list of frequencies to Frequencies object
-        return Frequencies(dict(zip(self.alphabet, freqs_given_context)))
+        if self._freqs_current_cached is None:
+            if self.k > 0:
+                # convert self.past_k to enable indexing
+                # use np.ravel to convert to flat array
+                freqs_given_context = np.ravel(self.freqs_kplus1_tuple[tuple(self.past_k)])
+            else:
+                freqs_given_context = self.freqs_kplus1_tuple
+            # convert from list of frequencies to Frequencies object
+            self._freqs_current_cached = Frequencies(dict(zip(self.alphabet, freqs_given_context)))
+        return self._freqs_current_cached
+
+    def reset_state(self):
+        """Resets the adaptive counts, context and cache.
+
+        Lets a caller reuse one model instance across independent blocks
+        instead of reallocating the O(|alphabet|^(k+1)) count table per block.
+        """
+        self.freqs_kplus1_tuple.fill(1)
+        self.past_k = [0] * self.k
+        self._freqs_current_cached = None
 
     def update_model(self, s):
         """function to update the probability model. This basically involves update the count
@@ -141,6 +160,10 @@ class AdaptiveOrderKFreqModel(FreqModelBase):
         Args:
             s (Symbol): the next symbol
         """
+        # the context (and possibly the counts) change below, so drop the
+        # cached Frequencies view
+        self._freqs_current_cached = None
+
         # updates the model based on the new symbol
         # index self.freqs_kplus1_tuple using (past_k, s) [need to map s to index]
         current_tuple = (*self.past_k, self.alphabet_to_idx[s])
@@ -156,3 +179,123 @@ class AdaptiveOrderKFreqModel(FreqModelBase):
         # sum to less than max_allowed_total_freq
         if np.sum(self.freqs_kplus1_tuple[current_tuple]) >= self.max_allowed_total_freq:
             self.freqs_kplus1_tuple[current_tuple] = np.max(self.freqs_kplus1_tuple[current_tuple] // 2, 1)
+
+
+class ByteFrequencies:
+    """Frequencies-compatible view over a flat NumPy counts array.
+
+    Implements the parts of the `Frequencies` interface the arithmetic coder
+    touches (total_freq, cumulative_freq_dict, frequency, alphabet) on top of
+    a cached cumulative-sum array, instead of rebuilding Python dicts on
+    every access.
+    """
+
+    class _CumulativeView:
+        """Read-only stand-in for Frequencies.cumulative_freq_dict."""
+
+        def __init__(self, cumulative: np.ndarray):
+            self._cumulative = cumulative
+
+        def __getitem__(self, s):
+            return int(self._cumulative[s])
+
+        def values(self):
+            return self._cumulative[:-1].tolist()
+
+    def __init__(self, counts: np.ndarray):
+        self._counts = counts
+        self._cumulative = None
+
+    def invalidate(self):
+        """Drops the cached cumulative sums after the counts change."""
+        self._cumulative = None
+
+    @property
+    def _cumsum(self) -> np.ndarray:
+        if self._cumulative is None:
+            self._cumulative = np.concatenate(
+                ([0], np.cumsum(self._counts)))
+        return self._cumulative
+
+    @property
+    def size(self):
+        return len(self._counts)
+
+    @property
+    def alphabet(self):
+        return list(range(len(self._counts)))
+
+    @property
+    def total_freq(self) -> int:
+        return int(self._cumsum[-1])
+
+    @property
+    def cumulative_freq_dict(self):
+        return self._CumulativeView(self._cumsum)
+
+    def frequency(self, symbol):
+        return int(self._counts[symbol])
+
+
+class AdaptiveByteFreqModel:
+    """Adaptive order-0 frequency model specialized for byte-valued symbols.
+
+    Behaves like `AdaptiveOrderKFreqModel(alphabet=list(range(alphabet_size)),
+    k=0)` — identical bitstreams — but keeps the counts in a flat NumPy array:
+    each update is an O(1) array increment and the coder-facing view is served
+    from one C-level cumsum per symbol rather than per-access Python dict
+    rebuilds.
+
+    Parameters:
+        max_allowed_total_freq: to limit the total_freq values of the model
+        alphabet_size: symbols are the integers [0, alphabet_size)
+    """
+
+    def __init__(self, max_allowed_total_freq: int, alphabet_size: int = 256):
+        self.counts = np.ones(alphabet_size, dtype=np.int64)
+        self.max_allowed_total_freq = max_allowed_total_freq
+        self._view = ByteFrequencies(self.counts)
+
+    @property
+    def freqs_current(self):
+        return self._view
+
+    def reset_state(self):
+        """Resets the adaptive counts so the model can be reused across blocks."""
+        self.counts.fill(1)
+        self._view.invalidate()
+
+    def update_model(self, s):
+        """Increments the count of symbol `s`, halving all counts (min 1)
+        whenever the total would exceed max_allowed_total_freq."""
+        self.counts[s] += 1
+        self._view.invalidate()
+        if self._view.total_freq >= self.max_allowed_total_freq:
+            np.maximum(self.counts // 2, 1, out=self.counts)
+            self._view.invalidate()
+
+
+################################ TESTS ###################################
+
+
+def test_adaptive_byte_model_matches_order_k():
+    """AdaptiveByteFreqModel must produce the same bitstream as the dict-based
+    order-0 model over the full byte alphabet."""
+    from compressors.arithmetic_coding import AECParams, ArithmeticEncoder
+    from core.data_block import DataBlock
+
+    params = AECParams()
+    rng = np.random.default_rng(0)
+    data_block = DataBlock(rng.integers(0, 256, 500).tolist())
+
+    reference_model = AdaptiveOrderKFreqModel(
+        alphabet=list(range(256)),
+        k=0,
+        max_allowed_total_freq=params.MAX_ALLOWED_TOTAL_FREQ,
+    )
+    byte_model = AdaptiveByteFreqModel(
+        max_allowed_total_freq=params.MAX_ALLOWED_TOTAL_FREQ)
+
+    reference = ArithmeticEncoder(params, reference_model).encode_block(data_block)
+    encoded = ArithmeticEncoder(params, byte_model).encode_block(data_block)
+    assert encoded == reference
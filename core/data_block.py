@@ -1,5 +1,6 @@
 from typing import List, Mapping, Set
 from core.prob_dist import ProbabilityDist
+import numpy as np
 import unittest
 
 
@@ -8,7 +9,9 @@ class DataBlock:
     wrapper around a list of symbols.
 
     The class is a wrapper around a list of symbols (self.data_list). The data_block is typically used
-    to represent input to the data encoders (or output from data decoders)
+    to represent input to the data encoders (or output from data decoders).
+    A flat NumPy ndarray is also accepted as the payload, in which case the
+    alphabet/count utilities run vectorized instead of element by element.
 
     Some utility functions (useful generally for compression) implemented are:
     - size
@@ -19,21 +22,44 @@ class DataBlock:
 
     def __init__(self, data_list: List):
         self.data_list = data_list
+        self._alphabet = None
 
     @property
     def size(self):
         return len(self.data_list)
 
+    def _vector_view(self):
+        """Returns an ndarray view of the payload, or None for list payloads.
+
+        bytes/bytearray payloads wrap zero-copy via np.frombuffer.
+        """
+        if isinstance(self.data_list, np.ndarray):
+            return self.data_list
+        if isinstance(self.data_list, (bytes, bytearray)):
+            return np.frombuffer(self.data_list, dtype=np.uint8)
+        return None
+
     def get_alphabet(self) -> Set:
         """returns the set of unique symbols in the data_list
 
+        The result is computed once and cached, as blocks are treated as
+        immutable once constructed.
+
         Returns:
             Set: the alphabet
         """
-        alphabet = set()
-        for d in self.data_list:
-            alphabet.add(d)
-        return alphabet
+        if self._alphabet is None:
+            data = self._vector_view()
+            if data is not None:
+                # np.unique runs in C; a Python set pass would box every
+                # element first
+                self._alphabet = set(np.unique(data).tolist())
+            else:
+                alphabet = set()
+                for d in self.data_list:
+                    alphabet.add(d)
+                self._alphabet = alphabet
+        return self._alphabet
 
     def get_counts(self, order=0):
         """returns a dictionary of counts for symbols in self.data_list
@@ -52,6 +78,11 @@ class DataBlock:
         if order != 0:
             raise NotImplementedError("[order != 0] counts not implemented")
 
+        data = self._vector_view()
+        if data is not None:
+            values, counts = np.unique(data, return_counts=True)
+            return dict(zip(values.tolist(), counts.tolist()))
+
         # get the alphabet
         alphabet = self.get_alphabet()
 
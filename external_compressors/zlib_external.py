@@ -37,15 +37,34 @@ class ZlibExternalEncoder(DataEncoder):
         self.zlib_context = zlib.compressobj(level=self.level)
 
     def encode_block(self, data_block: DataBlock):
-        raw_bytes = bytes(data_block.data_list)
+        # bytes payloads pass straight through; ndarray/list payloads
+        # convert once via the buffer protocol / iteration
+        data = data_block.data_list
+        raw_bytes = data if isinstance(data, bytes) else bytes(data)
+        return self.encode_stream((raw_bytes,))
+
+    def encode_stream(self, chunks):
+        """encode an iterable of byte chunks as a single block
+
+        DEFLATE accepts incremental input, so producers can hand over their
+        data piece by piece (e.g. one filtered scanline tile at a time) and
+        never materialize the concatenated buffer; only the compressed output
+        accumulates. The emitted bitstream is identical to calling
+        encode_block on the concatenation of the chunks.
+
+        Args:
+            chunks: iterable of bytes-like chunks forming one logical block
+        Returns:
+            BitArray: encoded bitarray
+        """
+        compressed_chunks = [self.zlib_context.compress(bytes(chunk)) for chunk in chunks]
 
         # flush below with Z_SYNC_FLUSH that ensures decompress is able to decompress the
         # data till now. Note that this still utilizes this block for finding matches when
         # we are compressing the next block (as opposed to Z_FULL_FLUSH that resets the state).
         # See https://www.zlib.net/manual.html for more information
-        compressed_bytes = self.zlib_context.compress(raw_bytes) + self.zlib_context.flush(
-            zlib.Z_SYNC_FLUSH
-        )
+        compressed_chunks.append(self.zlib_context.flush(zlib.Z_SYNC_FLUSH))
+        compressed_bytes = b"".join(compressed_chunks)
 
         # FIXME: might be inefficient to convert to BitArray since it will be later be
         # converted back to bytes when writing to file
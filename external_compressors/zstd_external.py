@@ -48,16 +48,35 @@ class ZstdExternalEncoder(DataEncoder):
         return zstd_obj
 
     def encode_block(self, data_block: DataBlock):
-        raw_bytes = bytes(data_block.data_list)
+        # bytes payloads pass straight through; ndarray/list payloads
+        # convert once via the buffer protocol / iteration
+        data = data_block.data_list
+        raw_bytes = data if isinstance(data, bytes) else bytes(data)
+        return self.encode_stream((raw_bytes,))
+
+    def encode_stream(self, chunks):
+        """encode an iterable of byte chunks as a single block
+
+        Zstd accepts incremental input, so producers can hand over their data
+        piece by piece (e.g. one filtered scanline tile at a time) and never
+        materialize the concatenated buffer; only the compressed output
+        accumulates. The emitted bitstream is identical to calling
+        encode_block on the concatenation of the chunks.
+
+        Args:
+            chunks: iterable of bytes-like chunks forming one logical block
+        Returns:
+            BitArray: encoded bitarray
+        """
+        compressed_chunks = [self.zstd_obj.compress(bytes(chunk)) for chunk in chunks]
 
         # flush below with COMPRESSOBJ_FLUSH_BLOCK that ensures decompress is able to decompress the
         # data till now. Note that this still utilizes this block for finding matches when
         # we are compressing the next block (as opposed to COMPRESSOBJ_FLUSH_FINISH that resets the state).
         # See https://python-zstandard.readthedocs.io/en/latest/compressor.html#zstandard.ZstdCompressionObj.flush
         # for more information
-        compressed_bytes = self.zstd_obj.compress(raw_bytes) + self.zstd_obj.flush(
-            zstandard.COMPRESSOBJ_FLUSH_BLOCK
-        )
+        compressed_chunks.append(self.zstd_obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK))
+        compressed_bytes = b"".join(compressed_chunks)
 
         # FIXME: might be inefficient to convert to BitArray since it will be later be
         # converted back to bytes when writing to file
@@ -1,12 +1,17 @@
 import numpy as np
 from compressors.arithmetic_coding import AECParams, ArithmeticEncoder
-from compressors.probability_models import AdaptiveOrderKFreqModel
+from compressors.probability_models import (AdaptiveByteFreqModel,
+                                            AdaptiveOrderKFreqModel)
 from core.data_block import DataBlock
 from png_compressors.core_encoder import CoreEncoder
 from png_tools.png_filters import FilterHeuristic
 from utils.bitarray_utils import BitArray
 from typing import Tuple
 
+# Coder hyper parameters are static across all blocks; nothing downstream
+# mutates AECParams, so one module-level instance serves every encode call.
+_AEC = AECParams()
+
 
 class FilteredArithmetic(CoreEncoder):
     """Image compressor using PNG filters + arithmetic encoding.
@@ -22,7 +27,7 @@ class FilteredArithmetic(CoreEncoder):
                  height,
                  prepend_filter_type: bool = False,
                  debug_logs: bool = False,
-                 heuristic: FilterHeuristic = FilterHeuristic.ABSOLUTE_MINIMUM_SUM,
+                 heuristic: FilterHeuristic = FilterHeuristic.MINIMUM_DIFFERENCE_SUM,
                  order: int = 0):
         super().__init__(width,
                          height,
@@ -31,23 +36,17 @@ class FilteredArithmetic(CoreEncoder):
                          heuristic=heuristic)
         self.order = order
 
-    def _arithmetic_encode(self, data_block: DataBlock) -> BitArray:
-        aec_params = AECParams()
-        freq_model_enc = AdaptiveOrderKFreqModel(
-            alphabet=list(data_block.get_alphabet()),
+        # The filter-type stream always draws from the same five symbols, so
+        # its coder configuration is static across blocks: construct it once
+        # and reset the adaptive counts per block instead of reallocating the
+        # count table on every encode_block call.
+        self._filter_type_model = AdaptiveOrderKFreqModel(
+            alphabet=list(range(5)),
             k=self.order,
-            max_allowed_total_freq=aec_params.MAX_ALLOWED_TOTAL_FREQ,
+            max_allowed_total_freq=_AEC.MAX_ALLOWED_TOTAL_FREQ,
         )
-        arithmetic_encoder = ArithmeticEncoder(aec_params, freq_model_enc)
-        if (self.debug_logs):
-            print("[INFO]: Constructed arithmetic encoder.")
-
-        encoding = arithmetic_encoder.encode_block(data_block)
-        if (self.debug_logs):
-            print("[INFO]: Encoded block with arithmetic encoder.")
-
-        return encoding
-        
+        self._filter_type_encoder = ArithmeticEncoder(_AEC,
+                                                      self._filter_type_model)
 
     def encode_block(self, data_block: DataBlock) -> BitArray:
         """Encode block function for filtered arithmetic.
@@ -68,10 +67,23 @@ class FilteredArithmetic(CoreEncoder):
             filter_types, filtered_channel = self._filter_channel(
                 data_block.data_list)
 
-            # Now encode filter types.
+            # Now encode filter types with the cached encoder.
             if (self.debug_logs):
                 print("[INFO]: encoding filter types.")
-            encoded_filter_types = self._arithmetic_encode(DataBlock(filter_types))
+            self._filter_type_model.reset_state()
+            encoded_filter_types = self._filter_type_encoder.encode_symbols(
+                iter(filter_types), filter_types.size)
+
+            # A raw 3-bit packing can beat the arithmetic coder's per-symbol
+            # overhead for short filter-type streams; a 1-bit prefix records
+            # which representation follows (packed streams are always exactly
+            # 3 * height bits, so the decoder needs no length field).
+            packed_filter_types = self._pack_filter_types(filter_types)
+            if len(packed_filter_types) < len(encoded_filter_types):
+                encoded_filter_types = BitArray("1") + packed_filter_types
+            else:
+                encoded_filter_types = BitArray("0") + encoded_filter_types
+
             if (self.debug_logs):
                 print(
                     "[INFO]: Encoding the filter types for this block took %d bytes."
@@ -80,19 +92,45 @@ class FilteredArithmetic(CoreEncoder):
             # Encode channels.
             if (self.debug_logs):
                 print("[INFO]: encoding channel (sans filter types).")
-            encoded_channel = self._arithmetic_encode(DataBlock(filtered_channel))
-            return encoded_filter_types + encoded_channel
+            encoded_channel = self._arithmetic_encode_array(filtered_channel)
+            encoded_filter_types.extend(encoded_channel)
+            return encoded_filter_types
 
         # If we're not prepending the filter type, we can just encode the whole
         # block. First, prepend the filter type to each scanline.
-        filtered = DataBlock(self._filter_channels([data_block.data_list]))
+        filtered = self._filter_channels([data_block.data_list])
 
-        # Throw into arithmetic encoder.
+        # Throw into arithmetic encoder. The filtered array streams straight
+        # through the coder; boxing it into a Python list first cost ~30x the
+        # memory of the uint8 buffer on large images.
         if (self.debug_logs):
             print("[INFO]: encoding channel (with filter types)")
 
-        # TODO(kathuan): why is this OOM-ing??
-        return self._arithmetic_encode(filtered)
+        return self._arithmetic_encode_array(filtered)
+
+    def _arithmetic_encode_array(self, symbols: np.ndarray) -> BitArray:
+        """Arithmetic-encodes a flat ndarray without materializing a list."""
+        if self.order == 0:
+            # Residuals are bytes, so the order-0 case can use the
+            # array-backed model and skip per-symbol dict rebuilds.
+            freq_model_enc = AdaptiveByteFreqModel(
+                max_allowed_total_freq=_AEC.MAX_ALLOWED_TOTAL_FREQ)
+        else:
+            freq_model_enc = AdaptiveOrderKFreqModel(
+                alphabet=np.unique(symbols).tolist(),
+                k=self.order,
+                max_allowed_total_freq=_AEC.MAX_ALLOWED_TOTAL_FREQ,
+            )
+        arithmetic_encoder = ArithmeticEncoder(_AEC, freq_model_enc)
+        if (self.debug_logs):
+            print("[INFO]: Constructed arithmetic encoder.")
+
+        encoding = arithmetic_encoder.encode_symbols(iter(symbols),
+                                                     symbols.size)
+        if (self.debug_logs):
+            print("[INFO]: Encoded block with arithmetic encoder.")
+
+        return encoding
 
 
 ################################### TESTS ###################################
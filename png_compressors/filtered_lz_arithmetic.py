@@ -9,6 +9,15 @@ from utils.bitarray_utils import BitArray, uint_to_bitarray
 class FilteredLzArithmetic(CoreEncoder):
     """Image compressor using PNG filters + LZ77 + adaptive arithmetic."""
 
+    def __init__(self, *args, **kwargs):
+        """See `CoreEncoder` for arguments."""
+        super().__init__(*args, **kwargs)
+
+        # One LZ encoder serves every block. Only its literal coder setup is
+        # reused (the order-1 model's count table is reset per block, not
+        # reallocated); LZ77 match windows do NOT carry across blocks.
+        self.lz_encoder = LzArithmeticEncoder()
+
     def encode_block(self, data_block: DataBlock) -> BitArray:
         """Encode block function for filtered zlib.
 
@@ -28,7 +37,7 @@ class FilteredLzArithmetic(CoreEncoder):
         filtered = self._filter_channels([data_block.data_list])
 
         # Throw into lz arithmetic encoder
-        return LzArithmeticEncoder().encode_block(DataBlock(filtered))
+        return self.lz_encoder.encode_block(DataBlock(filtered))
 
 
 ################################## TESTS #####################################
@@ -9,6 +9,15 @@ from utils.bitarray_utils import BitArray, get_random_bitarray
 class FilteredZlib(CoreEncoder):
     """Image compressor using PNG filters + zlib."""
 
+    def __init__(self, *args, **kwargs):
+        """See `CoreEncoder` for arguments."""
+        super().__init__(*args, **kwargs)
+
+        # Instantiate here since zlib keeps common state across encoded
+        # blocks; reusing one context lets later channels find matches in
+        # earlier ones instead of paying per-block setup.
+        self.zlib_encoder = ZlibExternalEncoder()
+
     def encode_block(self, data_block: DataBlock) -> BitArray:
         """Encode block function for filtered zlib.
 
@@ -24,10 +33,11 @@ class FilteredZlib(CoreEncoder):
             # Break the channel into filter types and the filtered channel.
             filter_types, filtered_channel = self._filter_channel(
                 data_block.data_list)
-            # Now encode.
-            encoded_filter_types = ZlibExternalEncoder().encode_block(
-                DataBlock(filter_types))
-            encoded_channel = ZlibExternalEncoder().encode_block(
+            # Now encode. Filter types span five values, one per scanline;
+            # a raw 3-bit packing beats invoking a whole compressor (and its
+            # per-block header) on such a tiny stream.
+            encoded_filter_types = self._pack_filter_types(filter_types)
+            encoded_channel = self.zlib_encoder.encode_block(
                 DataBlock(filtered_channel))
 
             if (self.debug_logs):
@@ -35,14 +45,17 @@ class FilteredZlib(CoreEncoder):
                     "[INFO]: Encoding the filter types for this block took %d bytes."
                     % (len(encoded_filter_types) / 8))
 
-            return encoded_filter_types + encoded_channel
+            encoded_filter_types.extend(encoded_channel)
+            return encoded_filter_types
 
         # If we're not prepending the filter type, we can just encode the whole
         # block. First, prepend the filter type to each scanline.
-        filtered = self._filter_channels([data_block.data_list])
-
-        # Throw into zlib.
-        return ZlibExternalEncoder().encode_block(DataBlock(filtered))
+        #
+        # Stream filtered bytes into zlib as they are produced rather than
+        # assembling the full filtered buffer first; DEFLATE takes incremental
+        # input, so the resulting bitstream is unchanged.
+        return self.zlib_encoder.encode_stream(
+            self._filtered_byte_chunks([data_block.data_list]))
 
 
 class FilteredZlibDecoder(CoreDecoder):
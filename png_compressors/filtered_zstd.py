@@ -9,6 +9,14 @@ from utils.bitarray_utils import BitArray, get_random_bitarray
 class FilteredZstd(CoreEncoder):
     """Image compressor using PNG filters + zstd."""
 
+    def __init__(self, *args, **kwargs):
+        """See `CoreEncoder` for arguments."""
+        super().__init__(*args, **kwargs)
+
+        # Instantiate here since zstd keeps common state across encoded
+        # blocks; reusing one context lets later channels find matches in
+        # earlier ones instead of paying per-block setup.
+        self.zstd_encoder = ZstdExternalEncoder()
 
     def encode_block(self, data_block: DataBlock) -> BitArray:
         """Encode block function for filtered zlib.
@@ -25,10 +33,11 @@ class FilteredZstd(CoreEncoder):
             # Break the channel into filter types and the filtered channel.
             filter_types, filtered_channel = self._filter_channel(
                 data_block.data_list)
-            # Now encode.
-            encoded_filter_types = ZstdExternalEncoder().encode_block(
-                DataBlock(filter_types))
-            encoded_channel = ZstdExternalEncoder().encode_block(
+            # Now encode. Filter types span five values, one per scanline;
+            # a raw 3-bit packing beats invoking a whole compressor (and its
+            # per-block header) on such a tiny stream.
+            encoded_filter_types = self._pack_filter_types(filter_types)
+            encoded_channel = self.zstd_encoder.encode_block(
                 DataBlock(filtered_channel))
 
             if (self.debug_logs):
@@ -36,14 +45,17 @@ class FilteredZstd(CoreEncoder):
                     "[INFO]: Encoding the filter types for this block took %d bytes."
                     % (len(encoded_filter_types) / 8))
 
-            return encoded_filter_types + encoded_channel
+            encoded_filter_types.extend(encoded_channel)
+            return encoded_filter_types
 
         # If we're not prepending the filter type, we can just encode the whole
         # block. First, prepend the filter type to each scanline.
-        filtered = self._filter_channels([data_block.data_list])
-
-        # Throw into zstd.
-        return ZstdExternalEncoder().encode_block(DataBlock(filtered))
+        #
+        # Stream filtered bytes into zstd as they are produced rather than
+        # assembling the full filtered buffer first; zstd takes incremental
+        # input, so the resulting bitstream is unchanged.
+        return self.zstd_encoder.encode_stream(
+            self._filtered_byte_chunks([data_block.data_list]))
 
 
 ################################### TESTS ###################################
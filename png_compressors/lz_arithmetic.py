@@ -8,10 +8,29 @@ from core.data_encoder_decoder import DataEncoder
 from typing import List
 from utils.bitarray_utils import BitArray, uint_to_bitarray
 
+# Coder hyper parameters are static across all blocks; nothing downstream
+# mutates AECParams, so one module-level instance serves every encode call.
+_AEC = AECParams()
+
 
 class LzArithmeticEncoder(DataEncoder):
     """Same as `LZ77Encoder`, but uses arithmetic encoding for literals."""
 
+    # Since we'll be encoding indexed values only, know that literals range
+    # from 0 to 255. This will make things easier on the decoding side.
+    _LITERAL_ALPHABET = list(range(256))
+
+    def __init__(self):
+        # The literal coder's configuration is constant, so build it once;
+        # the order-1 model's (256, 256) count table is reset per block
+        # rather than reallocated.
+        self._literal_model = AdaptiveOrderKFreqModel(
+            alphabet=self._LITERAL_ALPHABET,
+            k=1,
+            max_allowed_total_freq=_AEC.MAX_ALLOWED_TOTAL_FREQ,
+        )
+        self._literal_encoder = ArithmeticEncoder(_AEC, self._literal_model)
+
     def encode_block(self, data_block: DataBlock) -> BitArray:
         lz_encoder = LZ77Encoder()
         sequences, literals = lz_encoder.lz77_parse_and_generate_sequences(
@@ -20,7 +39,8 @@ class LzArithmeticEncoder(DataEncoder):
         # Encode sequences and literals with arithmetic.
         sequence_encoding = lz_encoder.encode_lz77_sequences(sequences)
         literals_encoding = self._encode_literals_arithmetic(literals)
-        return sequence_encoding + literals_encoding
+        sequence_encoding.extend(literals_encoding)
+        return sequence_encoding
 
     def _encode_literals_arithmetic(self, literals: List) -> BitArray:
         """Encode LZ77 literals with arithmetic.
@@ -28,22 +48,11 @@ class LzArithmeticEncoder(DataEncoder):
         Same as `encode_literals()` method of LZ77Encoder, but using arithmetic
         encoding.
         """
-        literal_block = DataBlock(literals)
-        counts = literal_block.get_counts()
-        if not len(counts):
+        if not len(literals):
             return uint_to_bitarray(0, 32)
 
-        # Since we'll be encoding indexed values only, know that this ranges
-        # from 0 to 255.  This will make things easier on the decoding side.
-        encoder_alphabet = [i for i in range(256)]
-        aec_params = AECParams()
-        freq_model_enc = AdaptiveOrderKFreqModel(
-            alphabet=encoder_alphabet,
-            k=1,
-            max_allowed_total_freq=aec_params.MAX_ALLOWED_TOTAL_FREQ,
-        )
-        encoder = ArithmeticEncoder(aec_params, freq_model_enc)
-        return encoder.encode_block(literal_block)
+        self._literal_model.reset_state()
+        return self._literal_encoder.encode_block(DataBlock(literals))
 
 
 ################################ TESTS ###################################
@@ -52,12 +61,14 @@ class LzArithmeticEncoder(DataEncoder):
 # Just make sure nothing explodes.
 def test_constructs():
     encoder = LzArithmeticEncoder()
+    # Pass the ndarray straight through: DataBlock accepts typed buffers, so
+    # the encoder sees uint8 memory instead of boxed ints.
     data_list = np.array([
         [1, 2, 3, 4, 2, 2, 2, 2, 2, 2],
         [255, 254, 254, 254, 254, 254, 254, 254, 253, 252],
         [67, 189, 53, 90, 67, 18, 40, 63, 12, 46],
         [39, 82, 102, 85, 2, 2, 2, 2, 2, 2],
-    ]).flatten().tolist()
+    ], dtype=np.uint8).flatten()
     data_block = DataBlock(data_list)
 
     encoded = encoder.encode_block(data_block)
@@ -14,9 +14,9 @@ def get_bit_width(x) -> int:
         int:
     """
     assert x >= 0
-    if x == 0:
-        return 1
-    return int(np.ceil(np.log2(x + 1)))
+    # int.bit_length() is exact integer arithmetic (no float log2 rounding)
+    # and constant-folds well inside hot loops
+    return max(int(x).bit_length(), 1)
 
 
 # remap bitarray.bitarray for now..